@@ -1,8 +1,8 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-from src.physics import LinkBudget
-from src.visualization import plot_earth_slice
+from src.physics import LinkBudget, LinkResult
+from src.visualization import build_earth_slice_figure, update_earth_slice
 
 st.set_page_config(page_title="Verdi UAS Link Budget Calculator", layout="wide")
 
@@ -16,8 +16,8 @@ st.sidebar.header("System Configuration")
 
 # RF Parameters
 st.sidebar.subheader("RF Parameters")
-freq = st.sidebar.number_input("Frequency (MHz)", value=414.0, step=1.0)
-bw = st.sidebar.number_input("Bandwidth (MHz)", value=5.0, step=0.5)
+freq = st.sidebar.number_input("Frequency (MHz)", min_value=1.0, value=414.0, step=1.0)
+bw = st.sidebar.number_input("Bandwidth (MHz)", min_value=0.1, value=5.0, step=0.5)
 tx_p_dbm = st.sidebar.number_input("TX Power (dBm)", value=50.0, step=0.5)
 tx_g_dbi = st.sidebar.number_input("TX Antenna Gain (dBi)", value=5.0, step=0.5)
 tx_l_db = st.sidebar.number_input("TX Cable Loss (dB)", value=1.0, step=0.1)
@@ -28,8 +28,8 @@ rx_nf_db = st.sidebar.number_input("RX Noise Figure (dB)", value=4.0, step=0.1)
 # Geometry
 st.sidebar.subheader("Geometry")
 dist_km = st.sidebar.slider("Link Distance (km)", 0.1, 150.0, 100.0, step=0.1)
-gcs_h = st.sidebar.number_input("GCS Height (m AGL)", value=10.0, step=1.0)
-drone_h = st.sidebar.number_input("Drone Height (m AGL)", value=100.0, step=10.0)
+gcs_h = st.sidebar.number_input("GCS Height (m AGL)", min_value=0.0, value=10.0, step=1.0)
+drone_h = st.sidebar.number_input("Drone Height (m AGL)", min_value=0.0, value=100.0, step=10.0)
 
 # Environment
 st.sidebar.subheader("Environment")
@@ -37,24 +37,38 @@ fade_margin = st.sidebar.number_input("Fade Margin (dB)", value=10.0, step=1.0)
 impl_loss = st.sidebar.number_input("Implementation Loss (dB)", value=2.0, step=0.5)
 
 # Calculation
-lb = LinkBudget(freq, bw, dist_km, gcs_h, drone_h, 
-                tx_p_dbm, tx_g_dbi, tx_l_db, rx_g_dbi, rx_l_db, rx_nf_db,
-                fade_margin, impl_loss)
-
-results = lb.run()
+# Streamlit reruns the whole script on every widget change. The link budget is
+# evaluated once over every slider distance in a single vectorized pass and
+# memoized, so moving the distance slider is just an array lookup.
+DIST_GRID_KM = np.linspace(0.1, 150.0, 1500)  # matches the distance slider steps
+DIST_STEP_KM = DIST_GRID_KM[1] - DIST_GRID_KM[0]
+
+@st.cache_data(max_entries=256)
+def sweep_link_budget(freq, bw, gcs_h, drone_h,
+                      tx_p_dbm, tx_g_dbi, tx_l_db, rx_g_dbi, rx_l_db, rx_nf_db,
+                      fade_margin, impl_loss):
+    return LinkBudget.run_vectorized(freq, bw, DIST_GRID_KM, gcs_h, drone_h,
+                                     tx_p_dbm, tx_g_dbi, tx_l_db, rx_g_dbi, rx_l_db, rx_nf_db,
+                                     fade_margin, impl_loss)
+
+sweep = sweep_link_budget(freq, bw, gcs_h, drone_h,
+                          tx_p_dbm, tx_g_dbi, tx_l_db, rx_g_dbi, rx_l_db, rx_nf_db,
+                          fade_margin, impl_loss)
+dist_idx = int(np.clip(round((dist_km - DIST_GRID_KM[0]) / DIST_STEP_KM), 0, len(DIST_GRID_KM) - 1))
+results = LinkResult._make(values[dist_idx].item() for values in sweep)
 
 # Metrics Row
 col1, col2, col3, col4 = st.columns(4)
 
-rsl = results['rsl']
-snr = results['snr']
-link_margin = snr - abs(results['noise_floor']) # Wait, Margin is RSL - Sensitivity?
+rsl = results.rsl
+snr = results.snr
+link_margin = snr - abs(results.noise_floor) # Wait, Margin is RSL - Sensitivity?
 # Or simpler: Margin = SNR_achieved - SNR_required
 # But we don't have a single SNR required, we have a table.
 # Let's show "Fade Margin" relative to QPSK limit? No.
 # Standard Link Margin usually implies Margin above Sensitivity.
 # Let's define sensitivity as Thermal Noise + NF + Required SNR for lowest rate (QPSK ~6dB).
-sensitivity = results['noise_floor'] + 6.0
+sensitivity = results.noise_floor + 6.0
 margin_at_lowest_rate = rsl - sensitivity
 
 # Color coding
@@ -83,24 +97,36 @@ col1.metric("RSL (Received Signal Level)", f"{rsl:.1f} dBm", delta=None)
 
 col2.metric("Link Margin (vs QPSK)", f"{margin_at_lowest_rate:.1f} dB", delta_color="normal" if margin_at_lowest_rate > 10 else "off")
 
-col3.metric("Throughput (Est)", f"{results['throughput_mbps']:.1f} Mbps", f"{results['modulation']}")
+col3.metric("Throughput (Est)", f"{results.throughput_mbps:.1f} Mbps", f"{results.modulation}")
 
-col4.metric("Path Loss (Total)", f"{results['total_loss']:.1f} dB", help=f"FSPL: {results['fspl']:.1f} dB, Diffraction: {results['diffraction_loss']:.1f} dB")
+col4.metric("Path Loss (Total)", f"{results.total_loss:.1f} dB", help=f"FSPL: {results.fspl:.1f} dB, Diffraction: {results.diffraction_loss:.1f} dB")
 
 # Warning Banners
-d_horizon = results['d_horizon_km']
+d_horizon = results.d_horizon_km
 if dist_km > d_horizon:
-    st.error(f"⚠️ **Beyond Radio Horizon** (horizon: {d_horizon:.1f} km). Smooth-earth diffraction loss: {results['diffraction_loss']:.1f} dB")
-elif not results['is_los']:
-    st.error(f"⚠️ **Obstructed Line of Sight!** Diffraction Loss: {results['diffraction_loss']:.1f} dB")
-elif results['min_clearance'] < results['f1_at_obstruction'] * 0.6:
+    st.error(f"⚠️ **Beyond Radio Horizon** (horizon: {d_horizon:.1f} km). Smooth-earth diffraction loss: {results.diffraction_loss:.1f} dB")
+elif not results.is_los:
+    st.error(f"⚠️ **Obstructed Line of Sight!** Diffraction Loss: {results.diffraction_loss:.1f} dB")
+elif results.min_clearance < results.f1_at_obstruction * 0.6:
      st.warning(f"⚠️ **Fresnel Zone Encroachment.** Clearance < 60% F1. Radio horizon: {d_horizon:.1f} km")
 else:
     st.success(f"✅ **Clear Line of Sight** (Radio horizon: {d_horizon:.1f} km)")
 
 # Visualization
 st.subheader("Earth Slice Visualization")
-fig = plot_earth_slice(lb)
+# The figure is built once per session and only depends on the path geometry.
+# Its trace data is patched when one of those inputs changes; RF-only widgets
+# (power, gains, noise figure, margins) leave it untouched.
+geom_params = (freq, dist_km, gcs_h, drone_h)
+if "earth_slice_fig" not in st.session_state:
+    st.session_state.earth_slice_fig = build_earth_slice_figure()
+if st.session_state.get("earth_slice_geom") != geom_params:
+    lb = LinkBudget(freq, bw, dist_km, gcs_h, drone_h,
+                    tx_p_dbm, tx_g_dbi, tx_l_db, rx_g_dbi, rx_l_db, rx_nf_db,
+                    fade_margin, impl_loss)
+    update_earth_slice(st.session_state.earth_slice_fig, lb)
+    st.session_state.earth_slice_geom = geom_params
+fig = st.session_state.earth_slice_fig
 st.plotly_chart(fig, use_container_width=True)
 
 # Detailed Data Table
@@ -113,10 +139,10 @@ with st.expander("Detailed Link Budget Breakdown"):
             "SNR", "Modulation"
         ],
         "Value": [
-            f"{freq} MHz", f"{dist_km} km", f"{results['fspl']:.2f} dB", f"{results['diffraction_loss']:.2f} dB",
-            f"{results['total_loss']:.2f} dB", f"{tx_p_dbm} dBm", f"{tx_g_dbi + rx_g_dbi} dBi", f"{impl_loss} dB",
-            f"{fade_margin} dB", f"{rsl:.2f} dBm", f"{results['noise_floor']:.2f} dBm",
-            f"{snr:.2f} dB", results['modulation']
+            f"{freq} MHz", f"{dist_km} km", f"{results.fspl:.2f} dB", f"{results.diffraction_loss:.2f} dB",
+            f"{results.total_loss:.2f} dB", f"{tx_p_dbm} dBm", f"{tx_g_dbi + rx_g_dbi} dBi", f"{impl_loss} dB",
+            f"{fade_margin} dB", f"{rsl:.2f} dBm", f"{results.noise_floor:.2f} dBm",
+            f"{snr:.2f} dB", results.modulation
         ]
     }
     st.table(pd.DataFrame(data))
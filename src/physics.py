@@ -1,203 +1,510 @@
+import math
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import NamedTuple
+
 import numpy as np
 
+# numba is an optional extra (not in requirements.txt): the app and verify.py
+# only use the NumPy paths, and only the scalar run() kernels benefit from it
+try:
+    from numba import njit
+except ImportError:  # kernels fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Closest approach to either antenna considered for obstruction, as a fraction
+# of path length (matches the first interior point of a 1000-step sweep)
+_ENDPOINT_FRACTION = 1.0 / 999.0
+
+
+@lru_cache(maxsize=8)
+def _unit_grid(steps):
+    """Read-only [0, 1] sample grid, scaled by the path length for each link."""
+    grid = np.linspace(0.0, 1.0, steps)
+    grid.flags.writeable = False
+    return grid
+
+
+def _log10(x):
+    """math.log10 with NumPy's edge cases (-inf at zero, NaN below) instead of
+    raising, so non-physical inputs show up in the results."""
+    if x > 0:
+        return math.log10(x)
+    return -math.inf if x == 0 else math.nan
+
+
+@lru_cache(maxsize=64)
+def _fspl_freq_term(freq_hz):
+    """Frequency part of FSPL in dB: 20*log10(f_Hz) - 147.55."""
+    return 20 * _log10(freq_hz) - 147.55
+
+
+@lru_cache(maxsize=64)
+def _radio_horizon(tx_h_m, rx_h_m, eff_earth_radius_m):
+    """Radio horizon distances (d_h1_m, d_h2_m, d_h_total_m) for two antennas.
+    A negative (non-physical) height gives NaN rather than raising."""
+    d_h1 = math.sqrt(2 * eff_earth_radius_m * tx_h_m) if tx_h_m >= 0 else math.nan
+    d_h2 = math.sqrt(2 * eff_earth_radius_m * rx_h_m) if rx_h_m >= 0 else math.nan
+    return d_h1, d_h2, d_h1 + d_h2
+
+
+@njit(cache=True, fastmath=True)
+def _min_clearance(dist_m, tx_h_m, rx_h_m, eff_earth_radius_m):
+    """Minimum ray clearance above the earth bulge, in closed form.
+    clearance(d) = tx_h + slope*d - d*(D - d)/(2*a_e) is a convex parabola in d,
+    so its minimum is the vertex d* = D/2 - slope*a_e, clamped to the path
+    interior (the antenna endpoints themselves have no Fresnel zone).
+    Returns (min_clearance_m, d_obstruction_m)."""
+    slope = (rx_h_m - tx_h_m) / dist_m
+    d_edge = dist_m * _ENDPOINT_FRACTION
+    d_star = 0.5 * dist_m - slope * eff_earth_radius_m
+    d_star = min(max(d_star, d_edge), dist_m - d_edge)
+    bulge = d_star * (dist_m - d_star) / (2 * eff_earth_radius_m)
+    return tx_h_m + slope * d_star - bulge, d_star
+
+
+@njit(cache=True, fastmath=True)
+def _height_gain(Y):
+    """ITU-R P.526 height-gain function G(Y) for a normalized antenna height."""
+    if Y > 2.0:
+        return 17.6 * math.sqrt(Y - 1.1) - 5.0 * math.log10(Y - 1.1) - 8.0
+    elif Y > 0:
+        return 20.0 * math.log10(Y + 0.1 * Y**3)
+    else:
+        return -100.0  # antenna at ground level
+
+
+def _smooth_earth_coefficients(wavelength, eff_earth_radius_m):
+    """ITU-R P.526 normalization factors for distance (X = d * X_coef) and
+    antenna height (Y = 2 * h * height_factor). Works on scalars and arrays."""
+    a_e = eff_earth_radius_m
+    X_coef = (math.pi / (wavelength * a_e**2)) ** (1.0 / 3.0)
+    height_factor = (math.pi**2 / (wavelength**2 * a_e)) ** (1.0 / 3.0)
+    return X_coef, height_factor
+
+
+@njit(cache=True, fastmath=True)
+def _smooth_earth_diffraction(dist_m, X_coef, height_factor, tx_h_m, rx_h_m):
+    """ITU-R P.526-15 Section 4.3: Smooth spherical Earth diffraction.
+    Assumes beta ~ 1 (valid for UHF frequencies > 20 MHz over land).
+    Takes the normalization factors from _smooth_earth_coefficients().
+    Returns diffraction loss in dB (positive value)."""
+    # Normalized distance
+    X = dist_m * X_coef
+
+    # Normalized antenna heights
+    Y1 = 2.0 * tx_h_m * height_factor
+    Y2 = 2.0 * rx_h_m * height_factor
+
+    # Distance attenuation F(X)
+    # Deep shadow formula valid for X >= 1.6
+    # For transition region (X < 1.6), linearly interpolate from 0 at X=0
+    if X >= 1.6:
+        F_X = 11.0 + 10.0 * math.log10(X) - 17.6 * X
+    else:
+        # F at X=1.6
+        F_at_boundary = 11.0 + 10.0 * math.log10(1.6) - 17.6 * 1.6
+        F_X = F_at_boundary * (X / 1.6)
+
+    # Total diffraction loss: L = -F(X) - G(Y1) - G(Y2)
+    loss_db = -F_X - _height_gain(Y1) - _height_gain(Y2)
+    return max(loss_db, 0.0)
+
+
+@njit(cache=True, fastmath=True)
+def _fresnel_radius(d1_m, dist_m, wavelength):
+    """1st Fresnel Zone radius at distance d1 from TX (zero at the antennas)."""
+    if d1_m <= 0 or d1_m >= dist_m:
+        return 0.0
+    d2_m = dist_m - d1_m
+    return math.sqrt((wavelength * d1_m * d2_m) / (d1_m + d2_m))
+
+
+@njit(cache=True, fastmath=True)
+def _knife_edge_loss(v_param):
+    """ITU-R P.526-15 knife-edge approximation J(v), zero for v <= -0.7."""
+    if v_param > -0.7:
+        loss_db = 6.9 + 20 * math.log10(
+            math.sqrt((v_param - 0.1)**2 + 1) + v_param - 0.1)
+        return max(loss_db, 0.0)
+    return 0.0
+
+
+@njit(cache=True, fastmath=True)
+def _diffraction_loss(dist_m, tx_h_m, rx_h_m, eff_earth_radius_m, wavelength,
+                      X_coef, height_factor, d_horizon_m):
+    """Knife-edge for LoS/near-LoS paths, smooth-earth beyond the radio horizon.
+    Returns (loss_db, min_clearance_m, f1_m, d_obstruction_m)."""
+    # Minimum clearance of the LOS ray above the earth bulge
+    min_clearance, d_obstruction = _min_clearance(dist_m, tx_h_m, rx_h_m, eff_earth_radius_m)
+
+    # Fresnel radius at worst point
+    f1 = _fresnel_radius(d_obstruction, dist_m, wavelength)
+
+    # Determine diffraction model based on radio horizon
+    if dist_m > d_horizon_m:
+        # BRLoS: use ITU-R P.526 smooth-earth diffraction
+        loss_db = _smooth_earth_diffraction(dist_m, X_coef, height_factor, tx_h_m, rx_h_m)
+    else:
+        # LoS / near-LoS: use knife-edge for Fresnel encroachment
+        if f1 == 0:
+            v_param = -100.0
+        else:
+            v_param = -1 * min_clearance * math.sqrt(2) / f1
+        loss_db = _knife_edge_loss(v_param)
+
+    return loss_db, min_clearance, f1, d_obstruction
+
+
+@njit(cache=True, fastmath=True)
+def _run_kernel(dist_m, tx_h_m, rx_h_m, eff_earth_radius_m, wavelength,
+                X_coef, height_factor, d_horizon_m, fspl_const, noise_floor,
+                fixed_gain, fixed_losses, snr_thresholds):
+    """Whole link budget for one link. Returns (fspl, diffraction_loss,
+    total_loss, rsl, snr, min_clearance, f1, d_obstruction, modulation_index)."""
+    fspl = 20 * math.log10(dist_m) + fspl_const
+    diff_loss, min_clearance, f1, d_obstruction = _diffraction_loss(
+        dist_m, tx_h_m, rx_h_m, eff_earth_radius_m, wavelength,
+        X_coef, height_factor, d_horizon_m)
+
+    total_loss = fspl + diff_loss + fixed_losses
+    rsl = fixed_gain - total_loss
+    snr_db = rsl - noise_floor
+
+    # Index of the highest modcod whose SNR threshold is met
+    i = 0
+    while i < len(snr_thresholds) and snr_db >= snr_thresholds[i]:
+        i += 1
+
+    return fspl, diff_loss, total_loss, rsl, snr_db, min_clearance, f1, d_obstruction, i
+
+
+# Vectorized counterparts of the scalar model, used by LinkBudget.run_vectorized.
+# Inputs broadcast against each other like NumPy ufuncs.
+
+def _min_clearance_vec(dist_m, tx_h_m, rx_h_m, eff_earth_radius_m):
+    """Array version of _min_clearance."""
+    slope = (rx_h_m - tx_h_m) / dist_m
+    d_edge = dist_m * _ENDPOINT_FRACTION
+    d_star = np.clip(0.5 * dist_m - slope * eff_earth_radius_m, d_edge, dist_m - d_edge)
+    bulge = d_star * (dist_m - d_star) / (2 * eff_earth_radius_m)
+    return tx_h_m + slope * d_star - bulge, d_star
+
+
+def _height_gain_vec(Y):
+    """ITU-R P.526 height-gain G(Y) for an array of normalized heights."""
+    Y = np.asarray(Y, dtype=float)
+    gain = np.full(Y.shape, -100.0)  # antenna at ground level
+    high = Y > 2.0
+    low = (Y > 0) & ~high
+    y_h = Y[high] - 1.1
+    gain[high] = 17.6 * np.sqrt(y_h) - 5.0 * np.log10(y_h) - 8.0
+    y_l = Y[low]
+    gain[low] = 20.0 * np.log10(y_l + 0.1 * y_l**3)
+    return gain
+
+
+def _smooth_earth_diffraction_vec(dist_m, X_coef, height_factor, tx_h_m, rx_h_m):
+    """Array version of _smooth_earth_diffraction."""
+    X = dist_m * X_coef
+
+    F_at_boundary = 11.0 + 10.0 * np.log10(1.6) - 17.6 * 1.6
+    X_deep = np.maximum(X, 1.6)
+    F_X = np.where(X >= 1.6,
+                   11.0 + 10.0 * np.log10(X_deep) - 17.6 * X_deep,
+                   F_at_boundary * (X / 1.6))
+
+    G_Y1 = _height_gain_vec(2.0 * tx_h_m * height_factor)
+    G_Y2 = _height_gain_vec(2.0 * rx_h_m * height_factor)
+    return np.maximum(-F_X - G_Y1 - G_Y2, 0.0)
+
+
+def _knife_edge_loss_vec(v_param):
+    """ITU-R P.526-15 knife-edge approximation J(v), zero for v <= -0.7."""
+    v = v_param - 0.1
+    loss_db = 6.9 + 20 * np.log10(np.sqrt(v**2 + 1) + v)
+    return np.where(v_param > -0.7, np.maximum(loss_db, 0.0), 0.0)
+
+
+class LinkResult(NamedTuple):
+    """Link budget results returned by LinkBudget.run(). The batched runs return
+    the same tuple with an array in each field."""
+    fspl: float
+    diffraction_loss: float
+    total_loss: float
+    rsl: float
+    noise_floor: float
+    snr: float
+    min_clearance: float
+    f1_at_obstruction: float
+    d_obstruction: float
+    throughput_mbps: float
+    modulation: str
+    is_los: bool
+    d_horizon_km: float
+
+
 class LinkBudget:
+    # Adaptive modulation table: SNR thresholds (dB) between consecutive
+    # modcods, and the modcod name / spectral efficiency (bit/s/Hz) above each
+    _SNR_THR = np.array([6.0, 10.0, 15.0, 20.0, 25.0, 30.0])
+    _MOD = ("No Link", "QPSK 1/2", "16QAM 1/2", "16QAM 3/4",
+            "64QAM 2/3", "64QAM 3/4", "256QAM")
+    _SE = (0.0, 1.0, 2.0, 3.0, 4.0, 4.5, 6.0)
+
+    # Constructor arguments, in order
+    PARAMS = ("freq_mhz", "bandwidth_mhz", "dist_km", "tx_h_m", "rx_h_m",
+              "tx_p_dbm", "tx_g_dbi", "tx_l_db", "rx_g_dbi", "rx_l_db", "rx_nf_db",
+              "fade_margin_db", "impl_loss_db")
+
+    # Constants
+    c = 3e8
+    k_factor = 1.33  # Standard 4/3 earth
+    earth_radius_km = 6371.0
+    eff_earth_radius_m = k_factor * earth_radius_km * 1000
+
     def __init__(self, freq_mhz, bandwidth_mhz, dist_km, tx_h_m, rx_h_m,
                  tx_p_dbm, tx_g_dbi, tx_l_db, rx_g_dbi, rx_l_db, rx_nf_db,
                  fade_margin_db=10.0, impl_loss_db=0.0):
-        self.freq_mhz = freq_mhz
-        self.freq_hz = freq_mhz * 1e6
-        self.bandwidth_mhz = bandwidth_mhz
-        self.dist_km = dist_km
-        self.dist_m = dist_km * 1000
-        self.tx_h_m = tx_h_m
-        self.rx_h_m = rx_h_m
-        self.tx_p_dbm = tx_p_dbm
-        self.tx_g_dbi = tx_g_dbi
-        self.tx_l_db = tx_l_db
-        self.rx_g_dbi = rx_g_dbi
-        self.rx_l_db = rx_l_db
-        self.rx_nf_db = rx_nf_db
-        self.fade_margin_db = fade_margin_db
-        self.impl_loss_db = impl_loss_db
-
-        # Constants
-        self.c = 3e8
-        self.k_factor = 1.33  # Standard 4/3 earth
-        self.earth_radius_km = 6371.0
-        self.eff_earth_radius_m = self.k_factor * self.earth_radius_km * 1000
-
-        self.wavelength = self.c / self.freq_hz
+        self.update(freq_mhz=freq_mhz, bandwidth_mhz=bandwidth_mhz, dist_km=dist_km,
+                    tx_h_m=tx_h_m, rx_h_m=rx_h_m, tx_p_dbm=tx_p_dbm, tx_g_dbi=tx_g_dbi,
+                    tx_l_db=tx_l_db, rx_g_dbi=rx_g_dbi, rx_l_db=rx_l_db, rx_nf_db=rx_nf_db,
+                    fade_margin_db=fade_margin_db, impl_loss_db=impl_loss_db)
+
+    def update(self, **params):
+        """Change link parameters in place, by constructor argument name, and
+        recompute the derived terms."""
+        # Reject unknown names before anything is stored, so a bad call leaves
+        # the link untouched
+        unknown = params.keys() - set(self.PARAMS)
+        if unknown:
+            raise TypeError(f"LinkBudget has no parameter(s) {', '.join(sorted(unknown))}")
+        for name, value in params.items():
+            # Stored as floats so the numba kernels compile a single signature
+            setattr(self, name, float(value))
+
+        self.freq_hz = self.freq_mhz * 1e6
+        self.dist_m = self.dist_km * 1000
+        self.wavelength = self.c / self.freq_hz if self.freq_hz else math.inf
+
+        # Frequency / bandwidth terms of FSPL and noise floor don't change per run
+        # (the FSPL term is shared by every link on the same frequency)
+        self._fspl_const = _fspl_freq_term(self.freq_hz)
+        self._noise_floor = -174 + 10 * _log10(self.bandwidth_mhz * 1e6) + self.rx_nf_db
+
+        # Distance-independent budget terms: TX power plus antenna gains (dBm)
+        # and the cable, fade and implementation losses (dB)
+        self._fixed_gain = self.tx_p_dbm + self.tx_g_dbi + self.rx_g_dbi
+        self._fixed_losses = self.tx_l_db + self.rx_l_db + self.impl_loss_db + self.fade_margin_db
+
+        # Smooth-earth diffraction normalization factors (NaN for a non-positive
+        # frequency, whose cube roots would otherwise come out complex)
+        if self.wavelength > 0:
+            self._X_coef, self._height_factor = _smooth_earth_coefficients(
+                self.wavelength, self.eff_earth_radius_m)
+        else:
+            self._X_coef = self._height_factor = math.nan
+
+        # Radio horizon only depends on antenna heights and earth radius, and
+        # is shared by every link with the same antennas
+        self.d_h1, self.d_h2, self.d_horizon_total = _radio_horizon(
+            self.tx_h_m, self.rx_h_m, self.eff_earth_radius_m)
+
+        # Sampled path geometry, keyed by number of steps, and the run() result
+        self._geom = {}
+        self._result = None
 
     def calculate_fspl(self):
         """Free Space Path Loss in dB."""
-        return 20 * np.log10(self.dist_m) + 20 * np.log10(self.freq_hz) - 147.55
+        return 20 * math.log10(self.dist_m) + self._fspl_const
 
     def calculate_fresnel_radius(self, d1_m):
         """Calculate 1st Fresnel Zone radius at distance d1 from TX."""
-        if d1_m <= 0 or d1_m >= self.dist_m:
-            return 0.0
-        d2_m = self.dist_m - d1_m
-        return np.sqrt((self.wavelength * d1_m * d2_m) / (d1_m + d2_m))
+        return _fresnel_radius(d1_m, self.dist_m, self.wavelength)
+
+    def calculate_geometry(self, steps=500):
+        """Sampled earth slice along the path, relative to a flat tangent at TX.
+        Returns a namespace of arrays (x, y_earth, y_los, f1, f1_poly_x,
+        f1_poly_y), cached per number of steps."""
+        geom = self._geom.get(steps)
+        if geom is not None:
+            return geom
+
+        dist_m = self.dist_m
+        inv_2ae = 0.5 / self.eff_earth_radius_m
+        x = _unit_grid(steps) * dist_m
+
+        # Earth drops away from the tangent as -x^2 / (2 * R_eff)
+        y_earth = -(x**2) * inv_2ae
+
+        # LoS ray from TX antenna to RX antenna (RX sits on the curved surface)
+        y_rx = -(dist_m**2) * inv_2ae + self.rx_h_m
+        y_los = self.tx_h_m + (y_rx - self.tx_h_m) / dist_m * x
+
+        # 1st Fresnel zone radius along the path. d1 + d2 = D, so the radius is
+        # sqrt(lambda * x * (D - x) / D), which is exactly zero at both ends.
+        f1 = dist_m - x
+        f1 *= x
+        f1 *= self.wavelength / dist_m
+        np.sqrt(f1, out=f1)
+
+        # Closed outline of the 1st Fresnel zone: upper edge out, lower edge back
+        f1_poly_x = np.empty(2 * steps)
+        f1_poly_x[:steps] = x
+        f1_poly_x[steps:] = x[::-1]
+        f1_poly_y = np.empty(2 * steps)
+        np.add(y_los, f1, out=f1_poly_y[:steps])
+        np.subtract(y_los[::-1], f1[::-1], out=f1_poly_y[steps:])
+
+        # Cached and shared by every caller, so read-only like _unit_grid
+        for arr in (x, y_earth, y_los, f1, f1_poly_x, f1_poly_y):
+            arr.flags.writeable = False
+        geom = SimpleNamespace(x=x, y_earth=y_earth, y_los=y_los, f1=f1,
+                               f1_poly_x=f1_poly_x, f1_poly_y=f1_poly_y)
+        self._geom[steps] = geom
+        return geom
 
     def calculate_radio_horizon(self):
         """Radio horizon distances for each terminal and total.
         Returns (d_h1_m, d_h2_m, d_h_total_m)."""
-        d_h1 = np.sqrt(2 * self.eff_earth_radius_m * self.tx_h_m)
-        d_h2 = np.sqrt(2 * self.eff_earth_radius_m * self.rx_h_m)
-        return d_h1, d_h2, d_h1 + d_h2
+        return self.d_h1, self.d_h2, self.d_horizon_total
 
     def _smooth_earth_diffraction(self):
         """ITU-R P.526-15 Section 4.3: Smooth spherical Earth diffraction.
-        Assumes beta ~ 1 (valid for UHF frequencies > 20 MHz over land).
         Returns diffraction loss in dB (positive value)."""
-        a_e = self.eff_earth_radius_m
-        lam = self.wavelength
-        d = self.dist_m
-
-        # Normalized distance
-        X = d * (np.pi / (lam * a_e**2)) ** (1.0 / 3.0)
-
-        # Normalized antenna heights
-        height_factor = (np.pi**2 / (lam**2 * a_e)) ** (1.0 / 3.0)
-        Y1 = 2.0 * self.tx_h_m * height_factor
-        Y2 = 2.0 * self.rx_h_m * height_factor
-
-        # Distance attenuation F(X)
-        # Deep shadow formula valid for X >= 1.6
-        # For transition region (X < 1.6), linearly interpolate from 0 at X=0
-        if X >= 1.6:
-            F_X = 11.0 + 10.0 * np.log10(X) - 17.6 * X
-        else:
-            # F at X=1.6
-            F_at_boundary = 11.0 + 10.0 * np.log10(1.6) - 17.6 * 1.6
-            F_X = F_at_boundary * (X / 1.6)
-
-        # Height-gain functions G(Y)
-        def height_gain(Y):
-            if Y > 2.0:
-                return 17.6 * np.sqrt(Y - 1.1) - 5.0 * np.log10(Y - 1.1) - 8.0
-            elif Y > 0:
-                return 20.0 * np.log10(Y + 0.1 * Y**3)
-            else:
-                return -100.0  # antenna at ground level
-
-        G_Y1 = height_gain(Y1)
-        G_Y2 = height_gain(Y2)
-
-        # Total diffraction loss: L = -F(X) - G(Y1) - G(Y2)
-        loss_db = -F_X - G_Y1 - G_Y2
-        return max(loss_db, 0.0)
+        return _smooth_earth_diffraction(self.dist_m, self._X_coef, self._height_factor,
+                                         self.tx_h_m, self.rx_h_m)
 
     def calculate_diffraction_loss(self):
         """Calculate diffraction loss due to earth curvature.
         Uses knife-edge for LoS/near-LoS paths, smooth-earth (ITU-R P.526-15)
         for beyond-radio-horizon paths."""
-        # Clearance geometry (used for visualization and LoS determination)
-        steps = 1000
-        d_vec = np.linspace(0, self.dist_m, steps)
-
-        # Earth bulge relative to chord connecting TX and RX surface positions
-        h_bulge_vec = (d_vec * (self.dist_m - d_vec)) / (2 * self.eff_earth_radius_m)
-
-        # LOS ray height (flat earth + bulge model)
-        slope = (self.rx_h_m - self.tx_h_m) / self.dist_m
-        h_ray_vec = self.tx_h_m + slope * d_vec
-
-        # Clearance = Ray Height - Earth Bulge
-        clearance_vec = h_ray_vec - h_bulge_vec
-
-        # Find minimum clearance (exclude endpoints)
-        valid_indices = slice(1, -1)
-        if steps < 3:
-             valid_indices = slice(0, steps)
-
-        clearance_to_check = clearance_vec[valid_indices]
-        d_to_check = d_vec[valid_indices]
-
-        min_clearance_idx_local = np.argmin(clearance_to_check)
-        min_clearance = clearance_to_check[min_clearance_idx_local]
-        d_obstruction = d_to_check[min_clearance_idx_local]
-
-        # Fresnel radius at worst point
-        f1 = self.calculate_fresnel_radius(d_obstruction)
-
-        # Determine diffraction model based on radio horizon
-        _, _, d_horizon_total = self.calculate_radio_horizon()
-
-        if self.dist_m > d_horizon_total:
-            # BRLoS: use ITU-R P.526 smooth-earth diffraction
-            loss_db = self._smooth_earth_diffraction()
-        else:
-            # LoS / near-LoS: use knife-edge for Fresnel encroachment
-            if f1 == 0:
-                v_param = -100
-            else:
-                v_param = -1 * min_clearance * np.sqrt(2) / f1
-
-            # ITU-R P.526-15 knife-edge approximation
-            if v_param > -0.7:
-                 loss_db = 6.9 + 20 * np.log10(
-                     np.sqrt((v_param - 0.1)**2 + 1) + v_param - 0.1)
-            else:
-                 loss_db = 0.0
-            loss_db = max(loss_db, 0.0)
-
-        return loss_db, min_clearance, f1, d_obstruction
+        return _diffraction_loss(self.dist_m, self.tx_h_m, self.rx_h_m,
+                                 self.eff_earth_radius_m, self.wavelength,
+                                 self._X_coef, self._height_factor, self.d_horizon_total)
 
     def calculate_thermal_noise(self):
         """Thermal Noise Floor (dBm) = -174 + 10*log10(BW_Hz) + NF"""
-        return -174 + 10 * np.log10(self.bandwidth_mhz * 1e6) + self.rx_nf_db
+        return self._noise_floor
 
     def run(self):
-        fspl = self.calculate_fspl()
-        diff_loss, min_clearance, f1_at_obstruction, d_obstruction = self.calculate_diffraction_loss()
-
-        total_loss = fspl + diff_loss + self.tx_l_db + self.rx_l_db + self.impl_loss_db + self.fade_margin_db
-        total_gain = self.tx_g_dbi + self.rx_g_dbi
-
-        rsl = self.tx_p_dbm + total_gain - total_loss
-
-        noise_floor = self.calculate_thermal_noise()
+        # The result only depends on the parameters, so it is kept until update()
+        if self._result is not None:
+            return self._result
+
+        (fspl, diff_loss, total_loss, rsl, snr_db, min_clearance, f1_at_obstruction,
+         d_obstruction, i) = _run_kernel(
+            self.dist_m, self.tx_h_m, self.rx_h_m, self.eff_earth_radius_m, self.wavelength,
+            self._X_coef, self._height_factor, self.d_horizon_total,
+            self._fspl_const, self._noise_floor,
+            self._fixed_gain, self._fixed_losses, self._SNR_THR)
+
+        noise_floor = self._noise_floor
+        modulation = self._MOD[i]
+        est_throughput = self._SE[i] * self.bandwidth_mhz
+
+        self._result = LinkResult(
+            fspl=fspl,
+            diffraction_loss=diff_loss,
+            total_loss=total_loss,
+            rsl=rsl,
+            noise_floor=noise_floor,
+            snr=snr_db,
+            min_clearance=min_clearance,
+            f1_at_obstruction=f1_at_obstruction,
+            d_obstruction=d_obstruction,
+            throughput_mbps=est_throughput,
+            modulation=modulation,
+            is_los=min_clearance > 0,
+            d_horizon_km=self.d_horizon_total / 1000.0,
+        )
+        return self._result
+
+    def run_batch(self, dist_km):
+        """Vectorized run() over an array of link distances (km), with every
+        other parameter taken from this instance. Returns a LinkResult whose
+        fields are arrays shaped like dist_km."""
+        return self.run_vectorized(
+            self.freq_mhz, self.bandwidth_mhz, dist_km, self.tx_h_m, self.rx_h_m,
+            self.tx_p_dbm, self.tx_g_dbi, self.tx_l_db, self.rx_g_dbi, self.rx_l_db,
+            self.rx_nf_db, self.fade_margin_db, self.impl_loss_db)
+
+    @classmethod
+    def run_many(cls, params):
+        """Vectorized run() over many links at once. params is an (N, 13) array
+        with one link per row, columns in PARAMS order. Returns a LinkResult
+        whose fields are arrays of N."""
+        # Column-major (order='F') params are already one contiguous array per
+        # parameter, so every ufunc below runs over unit-stride memory; a copy
+        # to that layout costs about as much as it saves, so none is made here
+        params = np.asarray(params, dtype=float)
+        return cls.run_vectorized(*params.T)
+
+    @classmethod
+    def run_vectorized(cls, freq_mhz, bandwidth_mhz, dist_km, tx_h_m, rx_h_m,
+                       tx_p_dbm, tx_g_dbi, tx_l_db, rx_g_dbi, rx_l_db, rx_nf_db,
+                       fade_margin_db=10.0, impl_loss_db=0.0):
+        """Array version of the whole link budget, without building an instance.
+        Arguments are the constructor arguments as scalars or arrays, broadcast
+        against each other. Returns a LinkResult whose fields are arrays."""
+        (freq_mhz, bandwidth_mhz, dist_km, tx_h_m, rx_h_m, tx_p_dbm, tx_g_dbi, tx_l_db,
+         rx_g_dbi, rx_l_db, rx_nf_db, fade_margin_db, impl_loss_db) = np.broadcast_arrays(
+            *(np.asarray(arg, dtype=float) for arg in (
+                freq_mhz, bandwidth_mhz, dist_km, tx_h_m, rx_h_m, tx_p_dbm, tx_g_dbi,
+                tx_l_db, rx_g_dbi, rx_l_db, rx_nf_db, fade_margin_db, impl_loss_db)))
+        a_e = cls.eff_earth_radius_m
+        freq_hz = freq_mhz * 1e6
+        dist_m = dist_km * 1000
+        wavelength = cls.c / freq_hz
+
+        fspl = 20 * np.log10(dist_m * freq_hz) - 147.55
+        noise_floor = -174 + 10 * np.log10(bandwidth_mhz * 1e6) + rx_nf_db
+
+        min_clearance, d_obstruction = _min_clearance_vec(dist_m, tx_h_m, rx_h_m, a_e)
+        f1 = np.sqrt(wavelength * d_obstruction * (dist_m - d_obstruction) / dist_m)
+
+        d_horizon_total = np.sqrt(2 * a_e * tx_h_m) + np.sqrt(2 * a_e * rx_h_m)
+
+        # Each diffraction model is only evaluated on the links that use it:
+        # smooth-earth beyond the radio horizon, knife-edge where the earth
+        # actually reaches into the Fresnel zone (J(v) is zero for v <= -0.7)
+        diff_loss = np.zeros(dist_m.shape)
+        beyond = dist_m > d_horizon_total
+        if beyond.any():
+            X_coef, height_factor = _smooth_earth_coefficients(wavelength[beyond], a_e)
+            diff_loss[beyond] = _smooth_earth_diffraction_vec(
+                dist_m[beyond], X_coef, height_factor, tx_h_m[beyond], rx_h_m[beyond])
+        v_param = -min_clearance * np.sqrt(2) / f1
+        edge = ~beyond & (v_param > -0.7)
+        if edge.any():
+            diff_loss[edge] = _knife_edge_loss_vec(v_param[edge])
+
+        total_loss = fspl + diff_loss + tx_l_db + rx_l_db + impl_loss_db + fade_margin_db
+        total_gain = tx_g_dbi + rx_g_dbi
+
+        rsl = tx_p_dbm + total_gain - total_loss
         snr_db = rsl - noise_floor
 
-        spectral_eff = 0
-        if snr_db < 6:
-            modulation = "No Link"
-        elif snr_db < 10:
-            modulation = "QPSK 1/2"
-            spectral_eff = 1.0
-        elif snr_db < 15:
-            modulation = "16QAM 1/2"
-            spectral_eff = 2.0
-        elif snr_db < 20:
-            modulation = "16QAM 3/4"
-            spectral_eff = 3.0
-        elif snr_db < 25:
-            modulation = "64QAM 2/3"
-            spectral_eff = 4.0
-        elif snr_db < 30:
-            modulation = "64QAM 3/4"
-            spectral_eff = 4.5
-        else:
-            modulation = "256QAM"
-            spectral_eff = 6.0
-
-        est_throughput = spectral_eff * self.bandwidth_mhz
-
-        _, _, d_horizon_total = self.calculate_radio_horizon()
-
-        return {
-            "fspl": fspl,
-            "diffraction_loss": diff_loss,
-            "total_loss": total_loss,
-            "rsl": rsl,
-            "noise_floor": noise_floor,
-            "snr": snr_db,
-            "min_clearance": min_clearance,
-            "f1_at_obstruction": f1_at_obstruction,
-            "d_obstruction": d_obstruction,
-            "throughput_mbps": est_throughput,
-            "modulation": modulation,
-            "is_los": min_clearance > 0,
-            "d_horizon_km": d_horizon_total / 1000.0,
-        }
+        i = np.searchsorted(cls._SNR_THR, snr_db, side='right')
+        modulation = np.asarray(cls._MOD)[i]
+        spectral_eff = np.asarray(cls._SE)[i]
+
+        return LinkResult(
+            fspl=fspl,
+            diffraction_loss=diff_loss,
+            total_loss=total_loss,
+            rsl=rsl,
+            noise_floor=noise_floor,
+            snr=snr_db,
+            min_clearance=min_clearance,
+            f1_at_obstruction=f1,
+            d_obstruction=d_obstruction,
+            throughput_mbps=spectral_eff * bandwidth_mhz,
+            modulation=modulation,
+            is_los=min_clearance > 0,
+            d_horizon_km=d_horizon_total / 1000.0,
+        )
@@ -0,0 +1,103 @@
+import math
+
+try:
+    import jax
+    import jax.numpy as jnp
+except ImportError as exc:  # jax is optional, only needed for this module
+    raise ImportError("src.physics_jax requires jax (pip install jax)") from exc
+
+from src.physics import (LinkBudget, LinkResult, _ENDPOINT_FRACTION,
+                         _smooth_earth_coefficients)
+
+# JAX version of the link budget, for sweeps that want XLA compilation, vmap
+# over parameters or gradients (e.g. d(snr)/d(rx_h_m)). Inputs are scalars;
+# branches are jnp.where with the unused side kept finite so gradients stay
+# clean. Results are float32 unless jax_enable_x64 is turned on.
+
+_SNR_THR = jnp.asarray(LinkBudget._SNR_THR)
+_SE = jnp.asarray(LinkBudget._SE)
+
+
+def _height_gain(Y):
+    """ITU-R P.526 height-gain function G(Y) for a normalized antenna height."""
+    y_h = jnp.maximum(Y, 2.0) - 1.1
+    y_l = jnp.where(Y > 0, Y, 1.0)
+    return jnp.where(Y > 2.0, 17.6 * jnp.sqrt(y_h) - 5.0 * jnp.log10(y_h) - 8.0,
+                     jnp.where(Y > 0, 20.0 * jnp.log10(y_l + 0.1 * y_l**3), -100.0))
+
+
+def _smooth_earth_diffraction(dist_m, X_coef, height_factor, tx_h_m, rx_h_m):
+    """ITU-R P.526-15 smooth spherical Earth diffraction loss in dB."""
+    X = dist_m * X_coef
+    F_at_boundary = 11.0 + 10.0 * math.log10(1.6) - 17.6 * 1.6
+    X_deep = jnp.maximum(X, 1.6)
+    F_X = jnp.where(X >= 1.6,
+                    11.0 + 10.0 * jnp.log10(X_deep) - 17.6 * X_deep,
+                    F_at_boundary * (X / 1.6))
+
+    G_Y1 = _height_gain(2.0 * tx_h_m * height_factor)
+    G_Y2 = _height_gain(2.0 * rx_h_m * height_factor)
+    return jnp.maximum(-F_X - G_Y1 - G_Y2, 0.0)
+
+
+def _knife_edge_loss(v_param):
+    """ITU-R P.526-15 knife-edge approximation J(v), zero for v <= -0.7."""
+    v = v_param - 0.1
+    loss_db = 6.9 + 20 * jnp.log10(jnp.sqrt(v**2 + 1) + v)
+    return jnp.where(v_param > -0.7, jnp.maximum(loss_db, 0.0), 0.0)
+
+
+@jax.jit
+def link_budget(freq_mhz, bandwidth_mhz, dist_km, tx_h_m, rx_h_m,
+                tx_p_dbm, tx_g_dbi, tx_l_db, rx_g_dbi, rx_l_db, rx_nf_db,
+                fade_margin_db=10.0, impl_loss_db=0.0):
+    """LinkBudget(...).run() in JAX. Returns a LinkResult of JAX scalars, except
+    that modulation holds the index of the modcod (JAX has no strings)."""
+    a_e = LinkBudget.eff_earth_radius_m
+    freq_hz = freq_mhz * 1e6
+    dist_m = dist_km * 1000
+    wavelength = LinkBudget.c / freq_hz
+
+    fspl = 20 * jnp.log10(dist_m * freq_hz) - 147.55
+    noise_floor = -174 + 10 * jnp.log10(bandwidth_mhz * 1e6) + rx_nf_db
+
+    # Minimum clearance at the vertex of the clearance parabola
+    slope = (rx_h_m - tx_h_m) / dist_m
+    d_edge = dist_m * _ENDPOINT_FRACTION
+    d_obstruction = jnp.clip(0.5 * dist_m - slope * a_e, d_edge, dist_m - d_edge)
+    bulge = d_obstruction * (dist_m - d_obstruction) / (2 * a_e)
+    min_clearance = tx_h_m + slope * d_obstruction - bulge
+    f1 = jnp.sqrt(wavelength * d_obstruction * (dist_m - d_obstruction) / dist_m)
+
+    d_horizon_total = jnp.sqrt(2 * a_e * tx_h_m) + jnp.sqrt(2 * a_e * rx_h_m)
+    X_coef, height_factor = _smooth_earth_coefficients(wavelength, a_e)
+    diff_loss = jnp.where(
+        dist_m > d_horizon_total,
+        _smooth_earth_diffraction(dist_m, X_coef, height_factor, tx_h_m, rx_h_m),
+        _knife_edge_loss(-min_clearance * math.sqrt(2) / f1))
+
+    total_loss = fspl + diff_loss + tx_l_db + rx_l_db + impl_loss_db + fade_margin_db
+    rsl = tx_p_dbm + tx_g_dbi + rx_g_dbi - total_loss
+    snr_db = rsl - noise_floor
+    i = jnp.searchsorted(_SNR_THR, snr_db, side='right')
+
+    return LinkResult(
+        fspl=fspl,
+        diffraction_loss=diff_loss,
+        total_loss=total_loss,
+        rsl=rsl,
+        noise_floor=noise_floor,
+        snr=snr_db,
+        min_clearance=min_clearance,
+        f1_at_obstruction=f1,
+        d_obstruction=d_obstruction,
+        throughput_mbps=_SE[i] * bandwidth_mhz,
+        modulation=i,
+        is_los=min_clearance > 0,
+        d_horizon_km=d_horizon_total / 1000.0,
+    )
+
+
+# Batched over the leading axis of every argument, like LinkBudget.run_many
+# with the (N, 13) params split into columns: run_batch(*params.T)
+run_batch = jax.jit(jax.vmap(link_budget))
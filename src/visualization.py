@@ -1,140 +1,95 @@
+import math
+
 import plotly.graph_objects as go
 import numpy as np
 
-def plot_earth_slice(link_budget_obj):
+# Trace order in the earth slice figure
+_EARTH, _FRESNEL, _LOS, _OBSTRUCTION, _TX, _RX = range(6)
+
+
+def _plot_steps(dist_km):
+    """Number of samples along the path, growing slowly with link length."""
+    return int(min(max(50 + 3 * math.sqrt(dist_km), 80), 500))
+
+
+def _obstruction_segment(x, y_earth, excess):
+    """Part of the earth surface where excess (earth height above the lower
+    Fresnel edge) is positive, as (x, y) arrays. The excess is concave along
+    the path, so this is a single stretch; its ends are interpolated to where
+    the excess crosses zero, so it doesn't depend on the sample spacing."""
+    inside = np.flatnonzero(excess > 0)
+    if inside.size == 0:
+        return x[:0], y_earth[:0]
+    first, last = inside[0], inside[-1]
+    lo, hi = max(first - 1, 0), min(last + 1, x.size - 1)
+    seg_x = x[lo:hi + 1].copy()
+    seg_y = y_earth[lo:hi + 1].copy()
+    for end, outside, edge in ((0, lo, first), (-1, hi, last)):
+        if outside != edge:
+            t = excess[outside] / (excess[outside] - excess[edge])
+            seg_x[end] = x[outside] + t * (x[edge] - x[outside])
+            seg_y[end] = y_earth[outside] + t * (y_earth[edge] - y_earth[outside])
+    return seg_x, seg_y
+
+
+def build_earth_slice_figure():
     """
-    Generates a Plotly figure showing the Earth slice, TX/RX, LoS, and Fresnel Zone.
+    Builds the styled Earth slice figure (Earth, Fresnel Zone, LoS, obstruction,
+    TX/RX markers) without any data. Fill it with update_earth_slice().
     """
-    lb = link_budget_obj
-    dist_m = lb.dist_m
-    if dist_m == 0:
-        return go.Figure()
+    traces = [
+        # 1. Earth Surface - Filled Area
+        go.Scattergl(
+            mode='lines',
+            fill='tozeroy',
+            name='Earth Surface',
+            line=dict(color='brown', width=2),
+            fillcolor='tan'
+        ),
 
-    # Generate X coordinates
-    x = np.linspace(0, dist_m, 500)
-    
-    # Earth Surface (Parabolic approximation using Effective Radius)
-    # y = -x^2 / (2 * Re_eff)
-    # But usually we define x=0 as TX location. 
-    # Let's center the parabola at dist/2 to make it symmetric?
-    # No, standard is TX at 0.
-    # However, to make it look like a hill between them if obstructed?
-    # No, simple model: TX at x=0.
-    
-    # Correct approach for "Curved Earth, Straight Ray":
-    # Earth surface drops as we move away from the tangent point (Tx).
-    # y_earth = - x^2 / (2 * R_eff) is correct if we assume tangent at x=0.
-    # But if looking from side, usually we want the "Bulge" in the middle.
-    # That happens if we define the "Reference Line" as the chord connecting x=0,y=0 and x=D,y=0?
-    # No.
-    # Let's stick to the standard k-factor engineering diagram:
-    # Earth curvature is y = -x^2 / (2 * k * Re) relative to a flat tangent at x=0.
-    
-    R_eff = lb.eff_earth_radius_m
-    y_earth = -(x**2) / (2 * R_eff)
-    
-    # TX Position
-    tx_pos = (0, lb.tx_h_m) # TX is at 0 distance, h_tx above reference (which is tangent, so 0)
-    
-    # RX Position
-    # Surface at D is -D^2 / (2 * R_eff)
-    y_surface_at_rx = -(dist_m**2) / (2 * R_eff)
-    rx_pos = (dist_m, y_surface_at_rx + lb.rx_h_m)
-    
-    # LoS Line
-    # Straight line between TX and RX
-    slope = (rx_pos[1] - tx_pos[1]) / (rx_pos[0] - tx_pos[0])
-    y_los = tx_pos[1] + slope * x
-    
-    # Fresnel Zones
-    d1 = x
-    d2 = dist_m - x
-    # Avoid division by zero at endpoints
-    with np.errstate(divide='ignore', invalid='ignore'):
-        f1 = np.sqrt((lb.wavelength * d1 * d2) / (d1 + d2))
-    f1[0] = 0
-    f1[-1] = 0
-    
-    y_f1_upper = y_los + f1
-    y_f1_lower = y_los - f1
-    
-    # Create Plot
-    fig = go.Figure()
-    
-    # 1. Earth Surface - Filled Area
-    # We want to fill down to some low value
-    y_min = min(np.min(y_earth), np.min(y_los)) - 100
-    
-    fig.add_trace(go.Scatter(
-        x=x, y=y_earth,
-        mode='lines',
-        fill='tozeroy',
-        name='Earth Surface',
-        line=dict(color='brown', width=2),
-        fillcolor='tan'
-    ))
-    
-    # 2. Fresnel Zone
-    # Create a closed polygon for the fill
-    x_poly = np.concatenate([x, x[::-1]])
-    y_poly = np.concatenate([y_f1_upper, y_f1_lower[::-1]])
-    
-    fig.add_trace(go.Scatter(
-        x=x_poly, y=y_poly,
-        fill='toself',
-        mode='lines',
-        name='1st Fresnel Zone',
-        line=dict(color='rgba(0, 255, 0, 0.4)', width=1),
-        fillcolor='rgba(0, 255, 0, 0.2)',
-        hoverinfo='skip'
-    ))
-    
-    # 3. LoS Line
-    fig.add_trace(go.Scatter(
-        x=[tx_pos[0], rx_pos[0]],
-        y=[tx_pos[1], rx_pos[1]],
-        mode='lines',
-        name='Line of Sight',
-        line=dict(color='blue', dash='dash')
-    ))
-    
-    # 4. Obstruction Highlight
-    # Identify points where Earth > Fresnel Lower (obstruction)
-    # Actually, technically obstruction is Earth > LoS - 0.6*F1 for 60% clearance logic
-    # But usually "Obstruction" means Earth > LoS.
-    # "Diffraction Zone" is Earth > LoS - F1.
-    
-    # Let's highlight where Earth penetrates the Fresnel Zone (Red)
-    obstruction_mask = y_earth > y_f1_lower
-    if np.any(obstruction_mask):
-        obs_x = x[obstruction_mask]
-        obs_y = y_earth[obstruction_mask]
-        fig.add_trace(go.Scatter(
-            x=obs_x, y=obs_y,
-            mode='markers',
+        # 2. Fresnel Zone (closed polygon for the fill)
+        go.Scattergl(
+            fill='toself',
+            mode='lines',
+            name='1st Fresnel Zone',
+            line=dict(color='rgba(0, 255, 0, 0.4)', width=1),
+            fillcolor='rgba(0, 255, 0, 0.2)',
+            hoverinfo='skip'
+        ),
+
+        # 3. LoS Line
+        go.Scattergl(
+            mode='lines',
+            name='Line of Sight',
+            line=dict(color='blue', dash='dash')
+        ),
+
+        # 4. Obstruction Highlight (segment of the earth surface)
+        go.Scattergl(
+            mode='lines',
             name='Obstruction',
-            marker=dict(color='red', size=2)
-        ))
-
-    # 5. TX and RX Markers
-    fig.add_trace(go.Scatter(
-        x=[tx_pos[0]], y=[tx_pos[1]],
-        mode='markers+text',
-        name='GCS (TX)',
-        text=['GCS'],
-        textposition='top center',
-        marker=dict(color='black', size=10, symbol='triangle-up')
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=[rx_pos[0]], y=[rx_pos[1]],
-        mode='markers+text',
-        name='UAS (RX)',
-        text=['UAS'],
-        textposition='top center',
-        marker=dict(color='black', size=10, symbol='diamond')
-    ))
-    
+            line=dict(color='red', width=4)
+        ),
+
+        # 5. TX and RX Markers
+        go.Scattergl(
+            mode='markers+text',
+            name='GCS (TX)',
+            text=['GCS'],
+            textposition='top center',
+            marker=dict(color='black', size=10, symbol='triangle-up')
+        ),
+
+        go.Scattergl(
+            mode='markers+text',
+            name='UAS (RX)',
+            text=['UAS'],
+            textposition='top center',
+            marker=dict(color='black', size=10, symbol='diamond')
+        ),
+    ]
+    fig = go.Figure(data=traces)
+
     # Layout Update
     fig.update_layout(
         title="Link Geometry (Effective Earth Curvature k=1.33)",
@@ -143,6 +98,8 @@ def plot_earth_slice(link_budget_obj):
         legend=dict(orientation="h", y=-0.2),
         margin=dict(l=20, r=20, t=40, b=20),
         height=500,
+        # Keep the user's zoom/pan when the traces are updated
+        uirevision='earth_slice',
         scene=dict(aspectmode='data') # Wait, this is 2D
     )
     # Fix Aspect Ratio to be somewhat realistic (or exaggerated Y?)
@@ -150,5 +107,53 @@ def plot_earth_slice(link_budget_obj):
     # Let's leave it auto, but maybe hint
     # fig.update_yaxes(scaleanchor="x", scaleratio=0.1) # Exaggerate Y by 10x?
     # User requested "Exaggerated scale"
-    
+
+    return fig
+
+
+def update_earth_slice(fig, link_budget_obj):
+    """
+    Rewrites the trace data of a figure from build_earth_slice_figure() in place
+    with the geometry of the given link. Returns the figure.
+    """
+    lb = link_budget_obj
+    dist_m = lb.dist_m
+
+    # Earth curvature is y = -x^2 / (2 * k * Re) relative to a flat tangent at
+    # the TX (standard k-factor engineering diagram). The geometry is shared
+    # with the physics model so it is only sampled once per link.
+    geom = lb.calculate_geometry(_plot_steps(lb.dist_km))
+    x = geom.x
+    y_earth = geom.y_earth
+    y_los = geom.y_los
+
+    # TX / RX Positions
+    tx_pos = (0, y_los[0])
+    rx_pos = (dist_m, y_los[-1])
+
+    # Lower Fresnel edge is the second half of the polygon, reversed (a view)
+    y_f1_lower = geom.f1_poly_y[:x.size - 1:-1]
+
+    # Highlight where Earth penetrates the Fresnel Zone (Red)
+    # Technically obstruction is Earth > LoS - 0.6*F1 for 60% clearance logic,
+    # "Diffraction Zone" is Earth > LoS - F1.
+    obs_x, obs_y = _obstruction_segment(x, y_earth, y_earth - y_f1_lower)
+
+    with fig.batch_update():
+        fig.data[_EARTH].update(x=x, y=y_earth)
+        fig.data[_FRESNEL].update(x=geom.f1_poly_x, y=geom.f1_poly_y)
+        fig.data[_LOS].update(x=[tx_pos[0], rx_pos[0]], y=[tx_pos[1], rx_pos[1]])
+        fig.data[_OBSTRUCTION].update(x=obs_x, y=obs_y, visible=bool(obs_x.size))
+        fig.data[_TX].update(x=[tx_pos[0]], y=[tx_pos[1]])
+        fig.data[_RX].update(x=[rx_pos[0]], y=[rx_pos[1]])
+
     return fig
+
+
+def plot_earth_slice(link_budget_obj):
+    """
+    Generates a Plotly figure showing the Earth slice, TX/RX, LoS, and Fresnel Zone.
+    """
+    if link_budget_obj.dist_m == 0:
+        return go.Figure()
+    return update_earth_slice(build_earth_slice_figure(), link_budget_obj)
@@ -1,69 +1,125 @@
+import sys
+
+import numpy as np
+
 from src.physics import LinkBudget
 
-def test_link_budget():
+def _field(label, key, fmt, expected=None):
+    """Report row as (result field, bound str.format of the whole line), so the
+    line template is assembled once at import instead of per report."""
+    template = f"{label}: {fmt}"
+    if expected:
+        template += f" ({expected})"
+    return key, template.format
+
+# (name, constructor kwargs, report fields built with _field)
+CASES = [
     # TestCase 1: 10km LoS (well within radio horizon)
-    lb = LinkBudget(
-        freq_mhz=2400, bandwidth_mhz=10, dist_km=10,
-        tx_h_m=10, rx_h_m=100,
-        tx_p_dbm=30, tx_g_dbi=0, tx_l_db=0, rx_g_dbi=0, rx_l_db=0, rx_nf_db=0,
-        fade_margin_db=0, impl_loss_db=0
-    )
-    res = lb.run()
-    print("--- Test Case 1: 10km LoS ---")
-    print(f"FSPL: {res['fspl']:.2f} dB (Expected ~120 dB)")
-    print(f"Diffraction Loss: {res['diffraction_loss']:.2f} dB (Expected 0 dB)")
-    print(f"Radio Horizon: {res['d_horizon_km']:.1f} km")
-    print(f"Is LoS: {res['is_los']}")
+    ("10km LoS",
+     dict(freq_mhz=2400, bandwidth_mhz=10, dist_km=10, tx_h_m=10, rx_h_m=100,
+          tx_p_dbm=30, tx_g_dbi=0, tx_l_db=0, rx_g_dbi=0, rx_l_db=0, rx_nf_db=0,
+          fade_margin_db=0, impl_loss_db=0),
+     [_field("FSPL", "fspl", "{:.2f} dB", "Expected ~120 dB"),
+      _field("Diffraction Loss", "diffraction_loss", "{:.2f} dB", "Expected 0 dB"),
+      _field("Radio Horizon", "d_horizon_km", "{:.1f} km"),
+      _field("Is LoS", "is_los", "{}")]),
 
     # TestCase 2: 100km BRLoS at 2.4 GHz (deeply obstructed)
     # Radio horizon at 10m/10m ~ 26 km, so 100 km is way beyond
-    lb2 = LinkBudget(
-        freq_mhz=2400, bandwidth_mhz=10, dist_km=100,
-        tx_h_m=10, rx_h_m=10,
-        tx_p_dbm=30, tx_g_dbi=0, tx_l_db=0, rx_g_dbi=0, rx_l_db=0, rx_nf_db=0,
-        fade_margin_db=0, impl_loss_db=0
-    )
-    res2 = lb2.run()
-    print("\n--- Test Case 2: 100km BRLoS (2.4 GHz, 10m/10m) ---")
-    print(f"FSPL: {res2['fspl']:.2f} dB")
-    print(f"Diffraction Loss: {res2['diffraction_loss']:.2f} dB (smooth-earth, expected >> knife-edge)")
-    print(f"Radio Horizon: {res2['d_horizon_km']:.1f} km")
-    print(f"Is LoS: {res2['is_los']}")
-    print(f"SNR: {res2['snr']:.2f} dB")
-    print(f"Modulation: {res2['modulation']}")
+    ("100km BRLoS (2.4 GHz, 10m/10m)",
+     dict(freq_mhz=2400, bandwidth_mhz=10, dist_km=100, tx_h_m=10, rx_h_m=10,
+          tx_p_dbm=30, tx_g_dbi=0, tx_l_db=0, rx_g_dbi=0, rx_l_db=0, rx_nf_db=0,
+          fade_margin_db=0, impl_loss_db=0),
+     [_field("FSPL", "fspl", "{:.2f} dB"),
+      _field("Diffraction Loss", "diffraction_loss", "{:.2f} dB", "smooth-earth, expected >> knife-edge"),
+      _field("Radio Horizon", "d_horizon_km", "{:.1f} km"),
+      _field("Is LoS", "is_los", "{}"),
+      _field("SNR", "snr", "{:.2f} dB"),
+      _field("Modulation", "modulation", "{}")]),
 
     # TestCase 3: Default scenario (414 MHz, 100km, 10m/100m)
     # Hand calc: diffraction ~ 51 dB, RSL ~ -133 dBm, No Link
-    lb3 = LinkBudget(
-        freq_mhz=414, bandwidth_mhz=5, dist_km=100,
-        tx_h_m=10, rx_h_m=100,
-        tx_p_dbm=50, tx_g_dbi=5, tx_l_db=1, rx_g_dbi=1.5, rx_l_db=1, rx_nf_db=4,
-        fade_margin_db=10, impl_loss_db=2
-    )
-    res3 = lb3.run()
-    print("\n--- Test Case 3: Default BRLoS (414 MHz, 100km, 10m/100m) ---")
-    print(f"FSPL: {res3['fspl']:.2f} dB (hand: 124.79)")
-    print(f"Diffraction Loss: {res3['diffraction_loss']:.2f} dB (hand: ~51.0)")
-    print(f"Radio Horizon: {res3['d_horizon_km']:.1f} km (hand: 54.2)")
-    print(f"Total Loss: {res3['total_loss']:.2f} dB (hand: ~189.8)")
-    print(f"RSL: {res3['rsl']:.2f} dBm (hand: ~-133.3)")
-    print(f"SNR: {res3['snr']:.2f} dB (hand: ~-30.3)")
-    print(f"Modulation: {res3['modulation']} (hand: No Link)")
+    ("Default BRLoS (414 MHz, 100km, 10m/100m)",
+     dict(freq_mhz=414, bandwidth_mhz=5, dist_km=100, tx_h_m=10, rx_h_m=100,
+          tx_p_dbm=50, tx_g_dbi=5, tx_l_db=1, rx_g_dbi=1.5, rx_l_db=1, rx_nf_db=4,
+          fade_margin_db=10, impl_loss_db=2),
+     [_field("FSPL", "fspl", "{:.2f} dB", "hand: 124.79"),
+      _field("Diffraction Loss", "diffraction_loss", "{:.2f} dB", "hand: ~51.0"),
+      _field("Radio Horizon", "d_horizon_km", "{:.1f} km", "hand: 54.2"),
+      _field("Total Loss", "total_loss", "{:.2f} dB", "hand: ~189.8"),
+      _field("RSL", "rsl", "{:.2f} dBm", "hand: ~-133.3"),
+      _field("SNR", "snr", "{:.2f} dB", "hand: ~-30.3"),
+      _field("Modulation", "modulation", "{}", "hand: No Link")]),
 
     # TestCase 4: Near radio horizon (54 km, should be near transition)
-    lb4 = LinkBudget(
-        freq_mhz=414, bandwidth_mhz=5, dist_km=54,
-        tx_h_m=10, rx_h_m=100,
-        tx_p_dbm=50, tx_g_dbi=5, tx_l_db=1, rx_g_dbi=1.5, rx_l_db=1, rx_nf_db=4,
-        fade_margin_db=10, impl_loss_db=2
-    )
-    res4 = lb4.run()
-    print("\n--- Test Case 4: Near Radio Horizon (54 km) ---")
-    print(f"Radio Horizon: {res4['d_horizon_km']:.1f} km")
-    print(f"Diffraction Loss: {res4['diffraction_loss']:.2f} dB")
-    print(f"Is LoS: {res4['is_los']}")
-    print(f"SNR: {res4['snr']:.2f} dB")
-    print(f"Modulation: {res4['modulation']}")
+    ("Near Radio Horizon (54 km)",
+     dict(freq_mhz=414, bandwidth_mhz=5, dist_km=54, tx_h_m=10, rx_h_m=100,
+          tx_p_dbm=50, tx_g_dbi=5, tx_l_db=1, rx_g_dbi=1.5, rx_l_db=1, rx_nf_db=4,
+          fade_margin_db=10, impl_loss_db=2),
+     [_field("Radio Horizon", "d_horizon_km", "{:.1f} km"),
+      _field("Diffraction Loss", "diffraction_loss", "{:.2f} dB"),
+      _field("Is LoS", "is_los", "{}"),
+      _field("SNR", "snr", "{:.2f} dB"),
+      _field("Modulation", "modulation", "{}")]),
+]
+
+# Reference values, one entry per case (None where there is none), checked
+# against the batched results with an absolute tolerance.
+# Hand calculations (the hints printed with the report)
+HAND_EXPECTED = {
+    "fspl": (120.0, None, 124.79, None),
+    "diffraction_loss": (0.0, None, 51.0, None),
+    "d_horizon_km": (None, None, 54.2, None),
+    "total_loss": (None, None, 189.8, None),
+    "rsl": (None, None, -133.3, None),
+    "snr": (None, None, -30.3, None),
+    "modulation": (None, None, "No Link", None),
+}
+# Regression values taken from the current model output, not hand-derived
+REGRESSION_EXPECTED = {
+    "d_horizon_km": (54.2, 26.0, None, 54.2),
+    "is_los": (True, False, None, None),
+    "modulation": (None, "No Link", None, None),
+}
+ATOL = 0.1
+
+def check_expected(res, expected_values, source):
+    """Assert the batched results against a table of expected values; source
+    names the table in the failure message."""
+    for key, expected in expected_values.items():
+        cases = [i for i, value in enumerate(expected) if value is not None]
+        actual = getattr(res, key)[cases]
+        wanted = [expected[i] for i in cases]
+        err_msg = f"{key} ({source}, cases {[i + 1 for i in cases]})"
+        if actual.dtype.kind == "f":
+            np.testing.assert_allclose(actual, wanted, rtol=0, atol=ATOL, err_msg=err_msg)
+        else:
+            np.testing.assert_array_equal(actual, wanted, err_msg=err_msg)
+
+def _report(title, res, i, fields):
+    """Report lines for case i of the batched results."""
+    lines = [f"--- {title} ---"]
+    lines.extend(fmt(getattr(res, key)[i]) for key, fmt in fields)
+    return lines
+
+def test_link_budget():
+    # All cases in one vectorized pass, params laid out column-major so each
+    # parameter is contiguous
+    params = np.array([[kwargs[name] for name in LinkBudget.PARAMS] for _, kwargs, _ in CASES],
+                      dtype=np.float64, order="F")
+    res = LinkBudget.run_many(params)
+
+    # Collect the report and write it out in one go
+    out = []
+    for i, (name, _, fields) in enumerate(CASES):
+        if out:
+            out.append("")
+        out.extend(_report(f"Test Case {i + 1}: {name}", res, i, fields))
+    sys.stdout.write("\n".join(out) + "\n")
+
+    check_expected(res, HAND_EXPECTED, "hand calculation")
+    check_expected(res, REGRESSION_EXPECTED, "regression value")
+    sys.stdout.write("OK\n")
 
 if __name__ == "__main__":
     test_link_budget()